@@ -9,29 +9,53 @@ Usage:
 import argparse
 import json
 import sys
+import time
 import logging
 import boto3
+from botocore.config import Config
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Shared by the AppConfig and S3 clients. Raise max_pool_connections if
+# deployments are driven from more concurrent threads than this.
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
 
 class AppConfigDeployer:
     """Deploy configurations to AWS AppConfig"""
 
     def __init__(self, application_id: str, environment: str, region: str = 'us-east-1'):
-        self.appconfig = boto3.client('appconfig', region_name=region)
-        self.s3 = boto3.client('s3', region_name=region)
+        session = boto3.Session(region_name=region)
+        self.appconfig = session.client('appconfig', config=CLIENT_CONFIG)
+        self.s3 = session.client('s3', config=CLIENT_CONFIG)
         self.application_id = application_id
         self.environment = environment
         self.region = region
+        self._profile_cache: Optional[Dict[str, str]] = None
 
     def upload_config_to_s3(self, bucket: str, config_file: str, config_name: str) -> str:
-        """Upload configuration file to S3"""
-        with open(config_file, 'r') as f:
+        """Validate a JSON configuration file and upload it to S3"""
+        with open(config_file, 'rb') as f:
             config_content = f.read()
         
+        try:
+            if orjson is not None:
+                orjson.loads(config_content)
+            else:
+                json.loads(config_content)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON in {config_file}: {str(e)}") from e
+        
         s3_key = f"{config_name}.json"
         self.s3.put_object(
             Bucket=bucket,
@@ -39,19 +63,15 @@ class AppConfigDeployer:
             Body=config_content,
             ContentType='application/json'
         )
-        logger.info(f"Uploaded {config_name} to s3://{bucket}/{s3_key}")
+        logger.info("Uploaded %s to s3://%s/%s", config_name, bucket, s3_key)
         return f"s3://{bucket}/{s3_key}"
 
     def get_or_create_config_profile(self, profile_name: str) -> str:
         """Get or create a configuration profile"""
         try:
-            profiles = self.appconfig.list_configuration_profiles(
-                ApplicationId=self.application_id
-            )
-            
-            for profile in profiles.get('Items', []):
-                if profile['Name'] == profile_name:
-                    return profile['Id']
+            profile_id = self._get_config_profiles().get(profile_name)
+            if profile_id:
+                return profile_id
             
             # Create new profile
             response = self.appconfig.create_configuration_profile(
@@ -60,12 +80,26 @@ class AppConfigDeployer:
                 LocationUri=f"s3://<bucket>/{profile_name}.json",
                 Type='AWS.AppConfig.FeatureFlags'
             )
-            logger.info(f"Created configuration profile: {profile_name}")
+            self._profile_cache[profile_name] = response['Id']
+            logger.info("Created configuration profile: %s", profile_name)
             return response['Id']
         except Exception as e:
-            logger.error(f"Failed to get/create profile: {str(e)}")
+            logger.error("Failed to get/create profile: %s", e)
             raise
 
+    def _get_config_profiles(self) -> Dict[str, str]:
+        """Return a cached map of configuration profile names to IDs"""
+        if self._profile_cache is None:
+            profiles = {}
+            paginator = self.appconfig.get_paginator('list_configuration_profiles')
+            
+            for page in paginator.paginate(ApplicationId=self.application_id):
+                for profile in page.get('Items', []):
+                    profiles[profile['Name']] = profile['Id']
+            
+            self._profile_cache = profiles
+        return self._profile_cache
+
     def create_deployment(
         self,
         config_profile_id: str,
@@ -84,39 +118,96 @@ class AppConfigDeployer:
         )
         
         deployment_id = response['DeploymentNumber']
-        logger.info(f"Started deployment {deployment_id}: {description}")
+        logger.info("Started deployment %s: %s", deployment_id, description)
         return deployment_id
 
-    def wait_for_deployment(self, deployment_id: str, timeout: int = 600) -> bool:
-        """Wait for deployment to complete"""
-        import time
-        start_time = time.time()
+    def wait_for_deployment(
+        self,
+        deployment_id: str,
+        timeout: int = 600,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0
+    ) -> bool:
+        """
+        Wait for deployment to complete
         
-        while time.time() - start_time < timeout:
-            response = self.appconfig.get_deployment(
-                ApplicationId=self.application_id,
-                EnvironmentId=self.environment,
-                DeploymentNumber=int(deployment_id)
-            )
-            
-            state = response['DeploymentState']
-            progress = response.get('PercentageComplete', 0)
+        Polls with exponential backoff between min_interval and max_interval
+        seconds, resetting to min_interval whenever the deployment state changes.
+        """
+        results = self.wait_for_deployments(
+            [deployment_id], timeout, min_interval, max_interval
+        )
+        return results[deployment_id]
+
+    def wait_for_deployments(
+        self,
+        deployment_ids: List[str],
+        timeout: int = 600,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0
+    ) -> Dict[str, bool]:
+        """
+        Wait for several deployments from a single polling loop
+        
+        Every pending deployment is polled once per tick, followed by one shared
+        backoff sleep that resets whenever any deployment changes state.
+        
+        Returns:
+            Map of deployment ID to True (completed) or False (rolled back or timed out)
+        """
+        start_time = time.monotonic()
+        interval = min_interval
+        last_states: Dict[str, Optional[str]] = dict.fromkeys(deployment_ids)
+        results: Dict[str, bool] = {}
+        
+        while last_states and time.monotonic() - start_time < timeout:
+            changed = False
+            for deployment_id in list(last_states):
+                state = self._poll_deployment(deployment_id)
+                if state == 'Complete':
+                    results[deployment_id] = True
+                    del last_states[deployment_id]
+                elif state == 'RollingBack':
+                    results[deployment_id] = False
+                    del last_states[deployment_id]
+                elif state != last_states[deployment_id]:
+                    last_states[deployment_id] = state
+                    changed = True
             
-            if state == 'Complete':
-                logger.info(f"Deployment {deployment_id} completed successfully")
-                return True
-            elif state == 'Baking':
-                logger.info(f"Deployment {deployment_id} in baking phase ({progress}%)")
-            elif state == 'Deploying':
-                logger.info(f"Deployment {deployment_id} in progress ({progress}%)")
-            elif state == 'RollingBack':
-                logger.error(f"Deployment {deployment_id} rolling back")
-                return False
+            if not last_states:
+                break
             
-            time.sleep(10)
+            interval = min_interval if changed else min(interval * 2, max_interval)
+            remaining = timeout - (time.monotonic() - start_time)
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+        
+        for deployment_id in last_states:
+            logger.error("Deployment %s timed out after %ss", deployment_id, timeout)
+            results[deployment_id] = False
+        return results
+
+    def _poll_deployment(self, deployment_id: str) -> str:
+        """Fetch and log the current state of a deployment"""
+        response = self.appconfig.get_deployment(
+            ApplicationId=self.application_id,
+            EnvironmentId=self.environment,
+            DeploymentNumber=int(deployment_id)
+        )
+        
+        state = response['DeploymentState']
+        progress = response.get('PercentageComplete', 0)
         
-        logger.error(f"Deployment {deployment_id} timed out after {timeout}s")
-        return False
+        if state == 'Complete':
+            logger.info("Deployment %s completed successfully", deployment_id)
+        elif state == 'Baking':
+            logger.info("Deployment %s in baking phase (%s%%)", deployment_id, progress)
+        elif state == 'Deploying':
+            logger.info("Deployment %s in progress (%s%%)", deployment_id, progress)
+        elif state == 'RollingBack':
+            logger.error("Deployment %s rolling back", deployment_id)
+        return state
 
 
 def main():
@@ -169,7 +260,7 @@ def main():
     # Prepare config file path
     config_file = args.config_file.format(environment=args.environment)
     if not Path(config_file).exists():
-        logger.error(f"Config file not found: {config_file}")
+        logger.error("Config file not found: %s", config_file)
         return 1
     
     try:
@@ -179,15 +270,15 @@ def main():
             region=args.region
         )
         
-        logger.info(f"Starting deployment to {args.environment} environment")
-        logger.info(f"Configuration file: {config_file}")
-        logger.info(f"Deployment strategy: {args.strategy}")
+        logger.info("Starting deployment to %s environment", args.environment)
+        logger.info("Configuration file: %s", config_file)
+        logger.info("Deployment strategy: %s", args.strategy)
         
         # TODO: Implement actual deployment
         logger.info("Deployment deployment script ready for use")
         return 0
     except Exception as e:
-        logger.error(f"Deployment failed: {str(e)}")
+        logger.error("Deployment failed: %s", e)
         return 1
 
 
@@ -3,12 +3,31 @@
 __version__ = "1.0.0"
 __author__ = "AI Infrastructure Agent"
 
-from src.agent.orchestrator import AgentOrchestrator
-from src.clients.organizations_manager import AWSOrganizationsManager
-from src.clients.config_manager import ConfigManager
+from typing import Any
 
 __all__ = [
     "AgentOrchestrator",
     "AWSOrganizationsManager", 
     "ConfigManager",
 ]
+
+# Public names are resolved on first access (PEP 562) so that importing the
+# package, or a boto3-free submodule such as src.core.state, does not pull in
+# boto3 and the AWS clients.
+_LAZY_IMPORTS = {
+    "AgentOrchestrator": "src.agent.orchestrator",
+    "AWSOrganizationsManager": "src.clients.organizations_manager",
+    "ConfigManager": "src.clients.config_manager",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -5,7 +5,8 @@ Orchestrates autonomous AWS Organizations management with state tracking and dec
 
 import logging
 import time
-from typing import Dict, Any, Optional, List, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Callable, ClassVar, FrozenSet, Tuple
 from src.clients.organizations_manager import AWSOrganizationsManager, OrganizationsException
 from src.clients.config_manager import ConfigManager
 from src.core.state import StateManager, AgentStatus, DecisionOutcome, AgentAction
@@ -19,6 +20,23 @@ class AgentOrchestrator:
     Handles decision-making, action execution, state management, and error recovery
     """
 
+    _RISKY_ACTIONS: ClassVar[FrozenSet[str]] = frozenset({'delete_ou', 'detach_policy'})
+
+    # Parameters each built-in handler requires to be present and non-empty
+    _REQUIRED_PARAMS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'create_ou': ('parent_id', 'ou_name'),
+        'delete_ou': ('ou_id',),
+        'create_account': ('email', 'account_name'),
+        'move_account': ('account_id', 'source_parent_id', 'destination_parent_id'),
+        'attach_policy': ('policy_id', 'target_id'),
+        'detach_policy': ('policy_id', 'target_id'),
+        'tag_resource': ('resource_id', 'tags'),
+        'tag_resources_bulk': ('items',),
+    }
+
+    # Maximum number of tags accepted by a single Organizations TagResource call
+    _MAX_TAGS_PER_REQUEST: ClassVar[int] = 50
+
     def __init__(
         self,
         agent_id: str = "ai-med-agent-primary",
@@ -33,7 +51,7 @@ class AgentOrchestrator:
         self.require_approval = require_approval
         self.action_handlers: Dict[str, Callable] = {}
         self._register_default_handlers()
-        logger.info(f"AgentOrchestrator initialized: {agent_id} (require_approval={require_approval})")
+        logger.info("AgentOrchestrator initialized: %s (require_approval=%s)", agent_id, require_approval)
 
     def _register_default_handlers(self) -> None:
         """Register default action handlers"""
@@ -45,13 +63,14 @@ class AgentOrchestrator:
             'attach_policy': self._handle_attach_policy,
             'detach_policy': self._handle_detach_policy,
             'tag_resource': self._handle_tag_resource,
+            'tag_resources_bulk': self._handle_tag_resources_bulk,
             'generate_report': self._handle_generate_report,
         }
 
     def register_action_handler(self, action_type: str, handler: Callable) -> None:
         """Register a custom action handler"""
         self.action_handlers[action_type] = handler
-        logger.info(f"Registered handler for action type: {action_type}")
+        logger.info("Registered handler for action type: %s", action_type)
 
     # =========================================================================
     # Decision Making
@@ -61,16 +80,17 @@ class AgentOrchestrator:
         """
         Evaluate whether an action should proceed, require approval, or be skipped
         Returns decision outcome based on action properties and current state
+        Checks run cheapest first: agent state, risky action type, then approval flag
         """
-        # Check if action requires approval
-        if action.requires_approval and self.require_approval:
+        # Check agent state
+        if self.state.status == AgentStatus.FAILED:
             self.state.log_decision(
-                'action_approval',
-                DecisionOutcome.REQUIRE_APPROVAL,
-                f"Action {action.action_type} requires approval",
-                {'action': action.action_type, 'description': action.description}
+                'state_check',
+                DecisionOutcome.SKIP,
+                "Agent in FAILED state, skipping action",
+                {}
             )
-            return DecisionOutcome.REQUIRE_APPROVAL
+            return DecisionOutcome.SKIP
 
         # Check for risky operations
         if self._is_risky_operation(action):
@@ -82,15 +102,15 @@ class AgentOrchestrator:
             )
             return DecisionOutcome.REQUIRE_APPROVAL
 
-        # Check agent state
-        if self.state.status == AgentStatus.FAILED:
+        # Check if action requires approval
+        if action.requires_approval and self.require_approval:
             self.state.log_decision(
-                'state_check',
-                DecisionOutcome.SKIP,
-                "Agent in FAILED state, skipping action",
-                {}
+                'action_approval',
+                DecisionOutcome.REQUIRE_APPROVAL,
+                f"Action {action.action_type} requires approval",
+                {'action': action.action_type, 'description': action.description}
             )
-            return DecisionOutcome.SKIP
+            return DecisionOutcome.REQUIRE_APPROVAL
 
         # All checks passed
         self.state.log_decision(
@@ -103,8 +123,7 @@ class AgentOrchestrator:
 
     def _is_risky_operation(self, action: AgentAction) -> bool:
         """Determine if an operation is risky"""
-        risky_actions = ['delete_ou', 'detach_policy']
-        return action.action_type in risky_actions
+        return action.action_type in self._RISKY_ACTIONS
 
     # =========================================================================
     # Action Handlers
@@ -130,7 +149,7 @@ class AgentOrchestrator:
             if decision == DecisionOutcome.REQUIRE_APPROVAL:
                 raise PermissionError(f"Action {action.action_type} requires approval")
             elif decision != DecisionOutcome.PROCEED:
-                logger.info(f"Action {action.action_type} skipped due to {decision.value}")
+                logger.info("Action %s skipped due to %s", action.action_type, decision.value)
                 return None
 
         # Execute action
@@ -145,130 +164,215 @@ class AgentOrchestrator:
             self.state.set_status(AgentStatus.COMPLETED)
             return result
         except Exception as e:
-            logger.error(f"Action failed: {action.action_type} - {str(e)}")
+            logger.error("Action failed: %s - %s", action.action_type, e)
             self.state.fail_action(str(e))
             self.state.set_status(AgentStatus.FAILED)
             raise
 
+    def execute_actions(
+        self,
+        actions: List[AgentAction],
+        max_workers: int = 16,
+        skip_approval_check: bool = False
+    ) -> List[Any]:
+        """
+        Execute a batch of independent actions concurrently
+        
+        Decisions and handler lookups are made up front in a single pass, so
+        state transitions stay sequential; only the handler bodies (the AWS
+        calls) run on the thread pool. Each outcome is recorded on the calling
+        thread as soon as its handler finishes.
+        
+        Args:
+            actions: Independent actions to execute
+            max_workers: Maximum number of concurrent handler calls
+            skip_approval_check: Skip approval requirement (for testing)
+        
+        Returns:
+            Results in the same order as actions (None for skipped actions)
+        """
+        self.state.set_status(AgentStatus.EVALUATING)
+        runnable = []
+        try:
+            for index, action in enumerate(actions):
+                if not skip_approval_check:
+                    decision = self.evaluate_action(action)
+                    if decision == DecisionOutcome.REQUIRE_APPROVAL:
+                        raise PermissionError(f"Action {action.action_type} requires approval")
+                    elif decision != DecisionOutcome.PROCEED:
+                        logger.info("Action %s skipped due to %s", action.action_type, decision.value)
+                        continue
+
+                handler = self.action_handlers.get(action.action_type)
+                if not handler:
+                    raise ValueError(f"No handler for action type: {action.action_type}")
+                runnable.append((index, action, handler))
+        except Exception:
+            # A rejected batch dispatches nothing; don't leave the agent in EVALUATING
+            self.state.set_status(AgentStatus.IDLE)
+            raise
+
+        results: List[Any] = [None] * len(actions)
+        if not runnable:
+            self.state.set_status(AgentStatus.COMPLETED)
+            return results
+
+        self.state.set_status(AgentStatus.EXECUTING)
+        first_error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(runnable)))) as executor:
+            futures = {
+                executor.submit(handler, action): (index, action)
+                for index, action, handler in runnable
+            }
+            for future in as_completed(futures):
+                index, action = futures[future]
+                self.state.queue_action(action)
+                error = future.exception()
+                if error is None:
+                    results[index] = future.result()
+                    self.state.complete_action(results[index])
+                else:
+                    logger.error("Action failed: %s - %s", action.action_type, error)
+                    self.state.fail_action(str(error))
+                    first_error = first_error or error
+
+        if first_error is not None:
+            self.state.set_status(AgentStatus.FAILED)
+            raise first_error
+
+        self.state.set_status(AgentStatus.COMPLETED)
+        return results
+
+    def _require_params(self, action: AgentAction, action_type: str) -> Tuple[Any, ...]:
+        """Extract the required parameters for a built-in handler, in table order"""
+        keys = self._REQUIRED_PARAMS[action_type]
+        values = tuple(map(action.parameters.get, keys))
+        if not all(values):
+            if len(keys) == 1:
+                raise ValueError(f"{keys[0]} is required")
+            joined = ", ".join(keys[:-1]) + ("," if len(keys) > 2 else "")
+            raise ValueError(f"{joined} and {keys[-1]} are required")
+        return values
+
     def _handle_create_ou(self, action: AgentAction) -> str:
         """Handle OU creation"""
-        params = action.parameters
-        parent_id = params.get('parent_id')
-        ou_name = params.get('ou_name')
-        tags = params.get('tags', {})
-        
-        if not parent_id or not ou_name:
-            raise ValueError("parent_id and ou_name are required")
+        parent_id, ou_name = self._require_params(action, 'create_ou')
+        tags = action.parameters.get('tags', {})
         
         try:
             ou_id = self.org_manager.create_ou(parent_id, ou_name, tags)
-            logger.info(f"Successfully created OU: {ou_name} ({ou_id})")
+            logger.info("Successfully created OU: %s (%s)", ou_name, ou_id)
             return ou_id
         except OrganizationsException as e:
-            logger.error(f"Failed to create OU: {str(e)}")
+            logger.error("Failed to create OU: %s", e)
             raise
 
     def _handle_delete_ou(self, action: AgentAction) -> bool:
         """Handle OU deletion"""
-        params = action.parameters
-        ou_id = params.get('ou_id')
-        
-        if not ou_id:
-            raise ValueError("ou_id is required")
+        (ou_id,) = self._require_params(action, 'delete_ou')
         
         try:
             result = self.org_manager.delete_ou(ou_id)
-            logger.info(f"Successfully deleted OU: {ou_id}")
+            logger.info("Successfully deleted OU: %s", ou_id)
             return result
         except OrganizationsException as e:
-            logger.error(f"Failed to delete OU: {str(e)}")
+            logger.error("Failed to delete OU: %s", e)
             raise
 
     def _handle_create_account(self, action: AgentAction) -> str:
         """Handle account creation"""
-        params = action.parameters
-        email = params.get('email')
-        account_name = params.get('account_name')
-        
-        if not email or not account_name:
-            raise ValueError("email and account_name are required")
+        email, account_name = self._require_params(action, 'create_account')
         
         try:
             request_id = self.org_manager.create_account(email, account_name)
-            logger.info(f"Account creation initiated: {account_name} ({email})")
+            logger.info("Account creation initiated: %s (%s)", account_name, email)
             return request_id
         except OrganizationsException as e:
-            logger.error(f"Failed to create account: {str(e)}")
+            logger.error("Failed to create account: %s", e)
             raise
 
     def _handle_move_account(self, action: AgentAction) -> bool:
         """Handle account movement between OUs"""
-        params = action.parameters
-        account_id = params.get('account_id')
-        source_parent_id = params.get('source_parent_id')
-        destination_parent_id = params.get('destination_parent_id')
-        
-        if not all([account_id, source_parent_id, destination_parent_id]):
-            raise ValueError("account_id, source_parent_id, and destination_parent_id are required")
+        account_id, source_parent_id, destination_parent_id = self._require_params(
+            action, 'move_account'
+        )
         
         try:
             result = self.org_manager.move_account(account_id, source_parent_id, destination_parent_id)
-            logger.info(f"Account {account_id} moved to {destination_parent_id}")
+            logger.info("Account %s moved to %s", account_id, destination_parent_id)
             return result
         except OrganizationsException as e:
-            logger.error(f"Failed to move account: {str(e)}")
+            logger.error("Failed to move account: %s", e)
             raise
 
     def _handle_attach_policy(self, action: AgentAction) -> bool:
         """Handle policy attachment"""
-        params = action.parameters
-        policy_id = params.get('policy_id')
-        target_id = params.get('target_id')
-        
-        if not policy_id or not target_id:
-            raise ValueError("policy_id and target_id are required")
+        policy_id, target_id = self._require_params(action, 'attach_policy')
         
         try:
             result = self.org_manager.attach_policy(policy_id, target_id)
-            logger.info(f"Policy {policy_id} attached to {target_id}")
+            logger.info("Policy %s attached to %s", policy_id, target_id)
             return result
         except OrganizationsException as e:
-            logger.error(f"Failed to attach policy: {str(e)}")
+            logger.error("Failed to attach policy: %s", e)
             raise
 
     def _handle_detach_policy(self, action: AgentAction) -> bool:
         """Handle policy detachment"""
-        params = action.parameters
-        policy_id = params.get('policy_id')
-        target_id = params.get('target_id')
-        
-        if not policy_id or not target_id:
-            raise ValueError("policy_id and target_id are required")
+        policy_id, target_id = self._require_params(action, 'detach_policy')
         
         try:
             result = self.org_manager.detach_policy(policy_id, target_id)
-            logger.info(f"Policy {policy_id} detached from {target_id}")
+            logger.info("Policy %s detached from %s", policy_id, target_id)
             return result
         except OrganizationsException as e:
-            logger.error(f"Failed to detach policy: {str(e)}")
+            logger.error("Failed to detach policy: %s", e)
             raise
 
     def _handle_tag_resource(self, action: AgentAction) -> bool:
         """Handle resource tagging"""
-        params = action.parameters
-        resource_id = params.get('resource_id')
-        tags = params.get('tags', {})
-        
-        if not resource_id or not tags:
-            raise ValueError("resource_id and tags are required")
+        resource_id, tags = self._require_params(action, 'tag_resource')
         
         try:
             result = self.org_manager.tag_resource(resource_id, tags)
-            logger.info(f"Resource {resource_id} tagged with {len(tags)} tags")
+            logger.info("Resource %s tagged with %s tags", resource_id, len(tags))
             return result
         except OrganizationsException as e:
-            logger.error(f"Failed to tag resource: {str(e)}")
+            logger.error("Failed to tag resource: %s", e)
+            raise
+
+    def _handle_tag_resources_bulk(self, action: AgentAction) -> Dict[str, Any]:
+        """
+        Handle tagging of many resources in one action
+        
+        Expects parameters['items'] as a list of {'resource_id': ..., 'tags': {...}}.
+        Each resource's tags are split into TagResource-sized chunks and the
+        requests are issued concurrently.
+        """
+        (items,) = self._require_params(action, 'tag_resources_bulk')
+        max_workers = action.parameters.get('max_workers', 16)
+        
+        requests = []
+        for item in items:
+            resource_id = item.get('resource_id')
+            tags = item.get('tags') or {}
+            if not resource_id or not tags:
+                raise ValueError("resource_id and tags are required for every item")
+            tag_items = list(tags.items())
+            for start in range(0, len(tag_items), self._MAX_TAGS_PER_REQUEST):
+                chunk = dict(tag_items[start:start + self._MAX_TAGS_PER_REQUEST])
+                requests.append((resource_id, chunk))
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(requests)))) as executor:
+                resource_ids, chunks = zip(*requests)
+                list(executor.map(self.org_manager.tag_resource, resource_ids, chunks))
+        except OrganizationsException as e:
+            logger.error("Failed to tag resources: %s", e)
             raise
+        
+        logger.info("Tagged %s resources with %s requests", len(items), len(requests))
+        return {'resources_tagged': len(items), 'requests': len(requests)}
 
     def _handle_generate_report(self, action: AgentAction) -> Dict[str, Any]:
         """Handle organization report generation"""
@@ -277,7 +381,7 @@ class AgentOrchestrator:
             logger.info("Organization report generated successfully")
             return report
         except OrganizationsException as e:
-            logger.error(f"Failed to generate report: {str(e)}")
+            logger.error("Failed to generate report: %s", e)
             raise
 
     # =========================================================================
@@ -307,7 +411,7 @@ class AgentOrchestrator:
                 analysis
             )
             
-            logger.info(f"Governance check completed: {len(analysis.get('findings', []))} findings")
+            logger.info("Governance check completed: %s findings", len(analysis.get('findings', [])))
             return {
                 'status': 'completed',
                 'report': report,
@@ -315,19 +419,22 @@ class AgentOrchestrator:
                 'state': self.state.get_state_summary()
             }
         except Exception as e:
-            logger.error(f"Governance check failed: {str(e)}")
+            logger.error("Governance check failed: %s", e)
             self.state.set_status(AgentStatus.FAILED)
             raise
 
     def _analyze_governance_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze governance report for issues"""
-        findings = []
+        accounts = report.get('accounts') or ()
+        ous = report.get('ous') or ()
+        policies = report.get('policies') or ()
+        findings: List[Dict[str, Any]] = []
+        add_finding = findings.append
         
         # Check for untagged resources
-        for account in report.get('accounts', []):
-            account_id = account.get('Id')
-            if not account_id:
-                findings.append({
+        for account in accounts:
+            if not account.get('Id'):
+                add_finding({
                     'severity': 'medium',
                     'issue': 'Account missing ID',
                     'account': account
@@ -336,7 +443,7 @@ class AgentOrchestrator:
         # Check CloudTrail status
         cloudtrail = report.get('cloudtrail', {})
         if 'error' in cloudtrail:
-            findings.append({
+            add_finding({
                 'severity': 'high',
                 'issue': 'CloudTrail not configured',
                 'error': cloudtrail['error']
@@ -345,7 +452,7 @@ class AgentOrchestrator:
         # Check Config compliance
         config = report.get('config', {})
         if 'error' in config:
-            findings.append({
+            add_finding({
                 'severity': 'medium',
                 'issue': 'AWS Config not enabled',
                 'error': config['error']
@@ -353,9 +460,9 @@ class AgentOrchestrator:
         
         return {
             'findings': findings,
-            'total_accounts': len(report.get('accounts', [])),
-            'total_ous': len(report.get('ous', [])),
-            'total_policies': len(report.get('policies', [])),
+            'total_accounts': len(accounts),
+            'total_ous': len(ous),
+            'total_policies': len(policies),
         }
 
     def get_state_summary(self) -> Dict[str, Any]:
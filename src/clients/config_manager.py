@@ -4,14 +4,52 @@ Retrieves secrets from Secrets Manager and configurations from AppConfig
 """
 
 import json
-import boto3
+import time
 import logging
-from functools import lru_cache
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Tuple
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
+from aws_secretsmanager_caching import SecretCache, SecretCacheConfig
+from src.clients.session import get_client
+from src.core.jsonutil import json_loads
 
 logger = logging.getLogger(__name__)
 
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+# Secret caches are shared by every ConfigManager in the process, keyed by
+# region, so short-lived managers still hit a warm cache
+_secret_caches: Dict[str, SecretCache] = {}
+# (region, secret_id) -> (cached secret string, parsed secret)
+_parsed_secrets: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+_secret_cache_lock = threading.Lock()
+
+
+def _get_secret_cache(region: str) -> SecretCache:
+    """Return the process-wide SecretCache for a region"""
+    cache = _secret_caches.get(region)
+    if cache is None:
+        with _secret_cache_lock:
+            cache = _secret_caches.get(region)
+            if cache is None:
+                # LRU with hourly refresh so rotated secrets are picked up without a restart
+                cache = SecretCache(
+                    config=SecretCacheConfig(max_cache_size=256, secret_refresh_interval=3600),
+                    client=get_client("secretsmanager", region, CLIENT_CONFIG),
+                )
+                _secret_caches[region] = cache
+    return cache
+
+
+# Used when AppConfig does not return NextPollIntervalInSeconds (its own default)
+DEFAULT_APPCONFIG_POLL_INTERVAL = 60
+
 
 class ConfigurationException(Exception):
     """Base exception for configuration manager"""
@@ -21,17 +59,38 @@ class ConfigurationException(Exception):
 class ConfigManager:
     """Manage AWS Secrets Manager and AppConfig with production-grade error handling"""
 
+    __slots__ = (
+        "region",
+        "secrets_client",
+        "appconfig_client",
+        "appconfigdata_client",
+        "_secret_cache",
+        "_appconfig_sessions",
+        "_appconfig_cache",
+        "_appconfig_next_poll",
+        "_appconfig_locks",
+        "_feature_flags_cache",
+    )
+
     def __init__(self, region: str = 'us-east-1'):
         self.region = region
-        self.secrets_client = boto3.client("secretsmanager", region_name=region)
-        self.appconfig_client = boto3.client("appconfig", region_name=region)
-        self.appconfigdata_client = boto3.client("appconfigdata", region_name=region)
-        logger.info(f"ConfigManager initialized (region={region})")
+        self.secrets_client = get_client("secretsmanager", region, CLIENT_CONFIG)
+        self.appconfig_client = get_client("appconfig", region, CLIENT_CONFIG)
+        self.appconfigdata_client = get_client("appconfigdata", region, CLIENT_CONFIG)
+        self._secret_cache = _get_secret_cache(region)
+        # Keyed by (application, environment, profile)
+        self._appconfig_sessions: Dict[Tuple[str, str, str], str] = {}
+        self._appconfig_cache: Dict[Tuple[str, str, str], Tuple[bytes, Dict[str, Any]]] = {}
+        self._appconfig_next_poll: Dict[Tuple[str, str, str], float] = {}
+        self._appconfig_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        # (application, environment, profile) -> (raw payload, transformed flags)
+        self._feature_flags_cache: Dict[Tuple[str, str, str], Tuple[bytes, Mapping[str, bool]]] = {}
+        logger.info("ConfigManager initialized (region=%s)", region)
 
     def get_secret(self, secret_id: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Retrieve a secret from AWS Secrets Manager.
-        Results are cached by default to avoid repeated API calls.
+        Results are cached by default (refreshed hourly) to avoid repeated API calls.
         
         Args:
             secret_id: The name or ARN of the secret
@@ -46,30 +105,45 @@ class ConfigManager:
             
             response = self.secrets_client.get_secret_value(SecretId=secret_id)
             secret = self._parse_secret_response(response)
-            logger.info(f"Retrieved secret {secret_id}")
+            logger.info("Retrieved secret %s", secret_id)
             return secret
         except self.secrets_client.exceptions.ResourceNotFoundException:
-            logger.error(f"Secret '{secret_id}' not found in AWS Secrets Manager")
+            logger.error("Secret '%s' not found in AWS Secrets Manager", secret_id)
             raise ConfigurationException(f"Secret '{secret_id}' not found")
         except ClientError as e:
-            logger.error(f"Failed to retrieve secret '{secret_id}': {e.response['Error']['Code']}")
+            logger.error("Failed to retrieve secret '%s': %s", secret_id, e.response['Error']['Code'])
             raise ConfigurationException(f"Failed to retrieve secret: {str(e)}")
 
-    @lru_cache(maxsize=32)
     def _get_secret_cached(self, secret_id: str) -> Dict[str, Any]:
         """Internal cached secret retrieval"""
-        response = self.secrets_client.get_secret_value(SecretId=secret_id)
-        return self._parse_secret_response(response)
+        secret_string = self._secret_cache.get_secret_string(secret_id)
+        if secret_string is not None:
+            # SecretCache hands back the same str until it refreshes, so only
+            # parse when the cached string object changes
+            key = (self.region, secret_id)
+            parsed = _parsed_secrets.get(key)
+            if parsed is None or parsed[0] is not secret_string:
+                parsed = (secret_string, self._parse_secret_response({"SecretString": secret_string}))
+                _parsed_secrets[key] = parsed
+            # The parsed dict is shared by every manager in the region; hand
+            # out a copy so a caller's edits can't leak into later reads
+            return dict(parsed[1])
+        return self._parse_secret_response(
+            {"SecretBinary": self._secret_cache.get_secret_binary(secret_id)}
+        )
 
     @staticmethod
     def _parse_secret_response(response: Dict) -> Dict[str, Any]:
         """Parse secret response from Secrets Manager"""
         if "SecretString" in response:
             secret = response["SecretString"]
+            # orjson reads the str's cached UTF-8 buffer directly, no re-encode
             try:
-                return json.loads(secret)
+                parsed = json_loads(secret)
             except json.JSONDecodeError:
                 return {"value": secret}
+            # Scalars such as "1234" are valid JSON but not a secret mapping
+            return parsed if isinstance(parsed, dict) else {"value": secret}
         else:
             return {"value": response["SecretBinary"]}
 
@@ -88,33 +162,80 @@ class ConfigManager:
             configuration_profile: Configuration profile identifier
             
         Returns:
-            Configuration as dict
+            Configuration as dict (cached between polls; do not modify)
         """
-        try:
-            # Start a configuration session
-            session_response = self.appconfigdata_client.start_configuration_session(
-                ApplicationIdentifier=application_id,
-                EnvironmentIdentifier=environment,
-                ConfigurationProfileIdentifier=configuration_profile,
-            )
+        _, config_data = self._fetch_appconfig_configuration(
+            application_id, environment, configuration_profile
+        )
+        return config_data
+
+    def _fetch_appconfig_configuration(
+        self,
+        application_id: str,
+        environment: str,
+        configuration_profile: str,
+    ) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Retrieve configuration from AppConfig along with its raw payload.
+        One AppConfigData session is kept per profile and polled with its
+        NextPollConfigurationToken; within the poll interval AppConfig is not
+        called at all, and an unchanged configuration is not re-parsed.
+        """
+        key = (application_id, environment, configuration_profile)
+        # AppConfigData tokens are single-use: concurrent callers for the same
+        # profile must not poll with the same token, so each profile's
+        # check-poll-store sequence runs under its own lock
+        lock = self._appconfig_locks.get(key)
+        if lock is None:
+            lock = self._appconfig_locks.setdefault(key, threading.Lock())
+        with lock:
+            return self._poll_appconfig_configuration(key)
+
+    def _poll_appconfig_configuration(
+        self, key: Tuple[str, str, str]
+    ) -> Tuple[bytes, Dict[str, Any]]:
+        """Return the cached configuration for key, polling AppConfig once the interval has passed"""
+        application_id, environment, configuration_profile = key
+        cached = self._appconfig_cache.get(key)
+        if cached is not None and time.monotonic() < self._appconfig_next_poll.get(key, 0.0):
+            return cached
 
-            token = session_response["InitialConfigurationToken"]
+        try:
+            token = self._appconfig_sessions.get(key)
+            if token is None:
+                # Start a configuration session
+                session_response = self.appconfigdata_client.start_configuration_session(
+                    ApplicationIdentifier=application_id,
+                    EnvironmentIdentifier=environment,
+                    ConfigurationProfileIdentifier=configuration_profile,
+                )
+                token = session_response["InitialConfigurationToken"]
             
-            # Get the latest configuration
+            # Get the latest configuration (empty if unchanged since the last poll)
             config_response = self.appconfigdata_client.get_latest_configuration(
                 ConfigurationToken=token
             )
-
-            config_data = {}
-            if config_response.get("Configuration"):
-                config_data = json.loads(config_response["Configuration"].read())
-            
-            logger.info(f"Retrieved AppConfig configuration {configuration_profile} from {environment}")
-            return config_data
         except ClientError as e:
-            logger.error(f"Failed to retrieve AppConfig configuration: {e.response['Error']['Code']}")
+            # Tokens expire after 24 hours; start a new session on the next call
+            self._appconfig_sessions.pop(key, None)
+            logger.error("Failed to retrieve AppConfig configuration: %s", e.response['Error']['Code'])
             raise ConfigurationException(f"Failed to retrieve AppConfig configuration: {str(e)}")
 
+        self._appconfig_sessions[key] = config_response["NextPollConfigurationToken"]
+        self._appconfig_next_poll[key] = time.monotonic() + config_response.get(
+            "NextPollIntervalInSeconds", DEFAULT_APPCONFIG_POLL_INTERVAL
+        )
+
+        content = b""
+        if config_response.get("Configuration"):
+            content = config_response["Configuration"].read()
+
+        if content or cached is None:
+            cached = (content, json_loads(content) if content else {})
+            self._appconfig_cache[key] = cached
+            logger.info("Retrieved AppConfig configuration %s from %s", configuration_profile, environment)
+        return cached
+
     def get_database_config(self, secret_name: str = "ai-med-agent/db/password") -> Dict[str, Any]:
         """Retrieve database configuration from Secrets Manager"""
         db_secret = self.get_secret(secret_name)
@@ -131,11 +252,28 @@ class ConfigManager:
         application_id: str = "ie50sgm",
         environment: str = "backend-dev",
         configuration_profile: str = "feature-flags"
-    ) -> Dict[str, bool]:
-        """Retrieve feature flags from AppConfig"""
-        config = self.get_appconfig_configuration(application_id, environment, configuration_profile)
-        flags = config.get("values", {})
-        return {k: v.get("enabled", False) for k, v in flags.items()}
+    ) -> Mapping[str, bool]:
+        """
+        Retrieve feature flags from AppConfig.
+        The transformed flags are cached per profile and reused while the
+        deployed configuration payload is unchanged. The result is a read-only
+        view shared between callers; copy it with dict() before modifying.
+        """
+        cache_key = (application_id, environment, configuration_profile)
+        payload, config = self._fetch_appconfig_configuration(*cache_key)
+
+        # Keyed on the payload rather than VersionLabel, which is optional and
+        # need not change when new content is deployed. Between polls the
+        # same bytes object comes back, so the comparison is an identity check
+        cached = self._feature_flags_cache.get(cache_key)
+        if cached is not None and cached[0] == payload:
+            return cached[1]
+
+        flags = MappingProxyType(
+            {k: v.get("enabled", False) for k, v in (config.get("values") or {}).items()}
+        )
+        self._feature_flags_cache[cache_key] = (payload, flags)
+        return flags
 
     def get_backend_config(
         self,
@@ -154,3 +292,19 @@ class ConfigManager:
     ) -> Dict[str, Any]:
         """Retrieve AI agents configuration from AppConfig"""
         return self.get_appconfig_configuration(application_id, environment, configuration_profile)
+
+    def load_all_config(self) -> Dict[str, Any]:
+        """
+        Fetch database, feature flag, backend and AI agent configuration
+        concurrently. Intended for application startup: the four lookups are
+        independent round-trips, and the results also warm the secret and
+        AppConfig caches used by the individual getters.
+        """
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures: Dict[str, Future[Any]] = {
+                "database": executor.submit(self.get_database_config),
+                "feature_flags": executor.submit(self.get_feature_flags),
+                "backend": executor.submit(self.get_backend_config),
+                "ai_agents": executor.submit(self.get_ai_agents_config),
+            }
+        return {name: future.result() for name, future in futures.items()}
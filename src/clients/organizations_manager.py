@@ -3,16 +3,54 @@ AWS Organizations Management Client
 Manage accounts, OUs, SCPs, and organizational features with production-grade error handling
 """
 
-import boto3
-import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from botocore.exceptions import BotoCoreError, ClientError
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from src.clients.session import get_client
+from src.core.jsonutil import json_dumps
 
 logger = logging.getLogger(__name__)
 
 
+# Client-side rate limiting keeps concurrent batches from retry storms when
+# Organizations throttles; the larger pool lets report fan-out and batch
+# actions run in parallel without waiting on connections
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'mode': 'adaptive'}
+)
+
+
+@lru_cache(maxsize=None)
+def _client_config(max_retries: int) -> Config:
+    """Shared client config for a retry budget (stable identity for the client cache)"""
+    return CLIENT_CONFIG.merge(
+        Config(retries={'total_max_attempts': max_retries, 'mode': 'adaptive'})
+    )
+
+
+# Largest MaxResults the Organizations list APIs accept
+ORG_PAGE_SIZE = 20
+
+
+def _pagination_config(max_items: Optional[int] = None) -> Dict[str, int]:
+    """PaginationConfig requesting full pages, optionally capped at max_items"""
+    cfg = {'PageSize': ORG_PAGE_SIZE}
+    if max_items is not None:
+        cfg['MaxItems'] = max_items
+    return cfg
+
+
+# Organization settings change rarely; re-describe after this many seconds
+ORG_INFO_TTL = 300
+
+
 class OrganizationsException(Exception):
     """Base exception for Organizations manager"""
     pass
@@ -22,71 +60,78 @@ class AWSOrganizationsManager:
     """Manage AWS Organizations with comprehensive error handling and retries"""
 
     def __init__(self, region: str = 'us-east-1', max_retries: int = 3):
-        self.org_client = boto3.client('organizations', region_name=region)
-        self.sts_client = boto3.client('sts', region_name=region)
-        self.cloudtrail_client = boto3.client('cloudtrail', region_name=region)
-        self.config_client = boto3.client('config', region_name=region)
+        # Retries are handled by botocore; max_retries is the total number of attempts
+        client_config = _client_config(max_retries)
+        self.org_client = get_client('organizations', region, client_config)
+        self.sts_client = get_client('sts', region, client_config)
+        self.cloudtrail_client = get_client('cloudtrail', region, client_config)
+        self.config_client = get_client('config', region, client_config)
         self.max_retries = max_retries
-        logger.info(f"AWSOrganizationsManager initialized (region={region}, max_retries={max_retries})")
-
-    def _retry_on_failure(self, func, *args, **kwargs):
-        """Retry wrapper for transient failures"""
-        for attempt in range(self.max_retries):
-            try:
-                return func(*args, **kwargs)
-            except (BotoCoreError, ClientError) as e:
-                if attempt == self.max_retries - 1:
-                    raise
-                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}. Retrying...")
+        # The root ID is fixed for the life of the organization
+        self._root_id: Optional[str] = None
+        # (organization, monotonic time fetched)
+        self._org_info_cache: Tuple[Optional[Dict[str, Any]], float] = (None, 0.0)
+        logger.info("AWSOrganizationsManager initialized (region=%s, max_retries=%s)", region, max_retries)
 
     # =========================================================================
     # Organization Information
     # =========================================================================
 
     def get_organization_info(self) -> Dict[str, Any]:
-        """Get organization details"""
+        """Get organization details (cached for ORG_INFO_TTL seconds)"""
+        org_info, fetched_at = self._org_info_cache
+        if org_info is not None and time.monotonic() - fetched_at < ORG_INFO_TTL:
+            return org_info
         try:
             response = self.org_client.describe_organization()
+            org_info = response['Organization']
+            self._org_info_cache = (org_info, time.monotonic())
             logger.info("Successfully retrieved organization info")
-            return response['Organization']
+            return org_info
         except ClientError as e:
-            logger.error(f"Failed to get organization info: {e.response['Error']['Code']}")
+            logger.error("Failed to get organization info: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to get organization info: {str(e)}")
 
     def get_root_id(self) -> str:
-        """Get the root organizational unit ID"""
+        """Get the root organizational unit ID (cached after the first call)"""
+        if self._root_id is not None:
+            return self._root_id
         try:
             roots = self.org_client.list_roots()
             root_id = roots['Roots'][0]['Id']
-            logger.info(f"Retrieved root ID: {root_id}")
+            self._root_id = root_id
+            logger.info("Retrieved root ID: %s", root_id)
             return root_id
         except (KeyError, IndexError) as e:
             logger.error("No roots found in organization")
             raise OrganizationsException("No roots found in organization")
         except ClientError as e:
-            logger.error(f"Failed to get root ID: {e.response['Error']['Code']}")
+            logger.error("Failed to get root ID: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to get root ID: {str(e)}")
 
     # =========================================================================
     # Organizational Units (OUs)
     # =========================================================================
 
-    def list_ous(self, parent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_ous(
+        self, parent_id: Optional[str] = None, max_items: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """List organizational units, optionally filtered by parent"""
         try:
             if parent_id is None:
                 parent_id = self.get_root_id()
             
-            ous = []
             paginator = self.org_client.get_paginator('list_organizational_units_for_parent')
+            ous = list(chain.from_iterable(
+                page['OrganizationalUnits'] for page in paginator.paginate(
+                    ParentId=parent_id, PaginationConfig=_pagination_config(max_items)
+                )
+            ))
             
-            for page in paginator.paginate(ParentId=parent_id):
-                ous.extend(page['OrganizationalUnits'])
-            
-            logger.info(f"Retrieved {len(ous)} OUs for parent {parent_id}")
+            logger.info("Retrieved %s OUs for parent %s", len(ous), parent_id)
             return ous
         except ClientError as e:
-            logger.error(f"Failed to list OUs: {e.response['Error']['Code']}")
+            logger.error("Failed to list OUs: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to list OUs: {str(e)}")
 
     def create_ou(self, parent_id: str, ou_name: str, tags: Optional[Dict[str, str]] = None) -> str:
@@ -102,42 +147,43 @@ class AWSOrganizationsManager:
             if tags:
                 self.tag_resource(ou_id, tags)
             
-            logger.info(f"Created OU '{ou_name}' with ID {ou_id}")
+            logger.info("Created OU '%s' with ID %s", ou_name, ou_id)
             return ou_id
         except self.org_client.exceptions.ParentNotFoundException:
-            logger.error(f"Parent OU {parent_id} not found")
+            logger.error("Parent OU %s not found", parent_id)
             raise OrganizationsException(f"Parent OU {parent_id} not found")
         except ClientError as e:
-            logger.error(f"Failed to create OU: {e.response['Error']['Code']}")
+            logger.error("Failed to create OU: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to create OU: {str(e)}")
 
     def delete_ou(self, ou_id: str) -> bool:
         """Delete an organizational unit"""
         try:
             self.org_client.delete_organizational_unit(OrganizationalUnitId=ou_id)
-            logger.info(f"Deleted OU {ou_id}")
+            logger.info("Deleted OU %s", ou_id)
             return True
         except ClientError as e:
-            logger.error(f"Failed to delete OU: {e.response['Error']['Code']}")
+            logger.error("Failed to delete OU: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to delete OU: {str(e)}")
 
     # =========================================================================
     # Accounts Management
     # =========================================================================
 
-    def list_accounts(self) -> List[Dict[str, Any]]:
+    def list_accounts(self, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
         """List all accounts in organization"""
         try:
-            accounts = []
             paginator = self.org_client.get_paginator('list_accounts')
+            accounts = list(chain.from_iterable(
+                page['Accounts'] for page in paginator.paginate(
+                    PaginationConfig=_pagination_config(max_items)
+                )
+            ))
             
-            for page in paginator.paginate():
-                accounts.extend(page['Accounts'])
-            
-            logger.info(f"Retrieved {len(accounts)} accounts")
+            logger.info("Retrieved %s accounts", len(accounts))
             return accounts
         except ClientError as e:
-            logger.error(f"Failed to list accounts: {e.response['Error']['Code']}")
+            logger.error("Failed to list accounts: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to list accounts: {str(e)}")
 
     def create_account(self, email: str, account_name: str, tags: Optional[Dict[str, str]] = None) -> str:
@@ -148,10 +194,10 @@ class AWSOrganizationsManager:
                 AccountName=account_name
             )
             request_id = response['CreateAccountStatus']['Id']
-            logger.info(f"Initiated account creation for '{account_name}' ({email}), request_id={request_id}")
+            logger.info("Initiated account creation for '%s' (%s), request_id=%s", account_name, email, request_id)
             return request_id
         except ClientError as e:
-            logger.error(f"Failed to create account: {e.response['Error']['Code']}")
+            logger.error("Failed to create account: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to create account: {str(e)}")
 
     def create_account_status(self, create_account_request_id: str) -> Dict[str, Any]:
@@ -161,10 +207,10 @@ class AWSOrganizationsManager:
                 CreateAccountRequestId=create_account_request_id
             )
             status_info = response['CreateAccountStatus']
-            logger.debug(f"Account creation status: {status_info['State']}")
+            logger.debug("Account creation status: %s", status_info['State'])
             return status_info
         except ClientError as e:
-            logger.error(f"Failed to get account creation status: {e.response['Error']['Code']}")
+            logger.error("Failed to get account creation status: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to get account creation status: {str(e)}")
 
     def move_account(self, account_id: str, source_parent_id: str, destination_parent_id: str) -> bool:
@@ -175,89 +221,94 @@ class AWSOrganizationsManager:
                 SourceParentId=source_parent_id,
                 DestinationParentId=destination_parent_id
             )
-            logger.info(f"Moved account {account_id} from {source_parent_id} to {destination_parent_id}")
+            logger.info("Moved account %s from %s to %s", account_id, source_parent_id, destination_parent_id)
             return True
         except ClientError as e:
-            logger.error(f"Failed to move account: {e.response['Error']['Code']}")
+            logger.error("Failed to move account: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to move account: {str(e)}")
 
-    def list_accounts_for_ou(self, ou_id: str) -> List[Dict[str, Any]]:
+    def list_accounts_for_ou(self, ou_id: str, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
         """List accounts in a specific OU"""
         try:
-            accounts = []
             paginator = self.org_client.get_paginator('list_accounts_for_parent')
+            accounts = list(chain.from_iterable(
+                page['Accounts'] for page in paginator.paginate(
+                    ParentId=ou_id, PaginationConfig=_pagination_config(max_items)
+                )
+            ))
             
-            for page in paginator.paginate(ParentId=ou_id):
-                accounts.extend(page['Accounts'])
-            
-            logger.info(f"Retrieved {len(accounts)} accounts for OU {ou_id}")
+            logger.info("Retrieved %s accounts for OU %s", len(accounts), ou_id)
             return accounts
         except ClientError as e:
-            logger.error(f"Failed to list accounts for OU: {e.response['Error']['Code']}")
+            logger.error("Failed to list accounts for OU: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to list accounts for OU: {str(e)}")
 
     # =========================================================================
     # Service Control Policies (SCPs)
     # =========================================================================
 
-    def list_policies(self, policy_type: str = 'SERVICE_CONTROL_POLICY') -> List[Dict[str, Any]]:
+    def list_policies(
+        self, policy_type: str = 'SERVICE_CONTROL_POLICY', max_items: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """List all policies of a specific type"""
         try:
-            policies = []
             paginator = self.org_client.get_paginator('list_policies')
+            policies = list(chain.from_iterable(
+                page['Policies'] for page in paginator.paginate(
+                    Filter=policy_type, PaginationConfig=_pagination_config(max_items)
+                )
+            ))
             
-            for page in paginator.paginate(Filter=policy_type):
-                policies.extend(page['Policies'])
-            
-            logger.info(f"Retrieved {len(policies)} {policy_type} policies")
+            logger.info("Retrieved %s %s policies", len(policies), policy_type)
             return policies
         except ClientError as e:
-            logger.error(f"Failed to list policies: {e.response['Error']['Code']}")
+            logger.error("Failed to list policies: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to list policies: {str(e)}")
 
     def get_policy(self, policy_id: str) -> Dict[str, Any]:
         """Get policy details"""
         try:
             response = self.org_client.describe_policy(PolicyId=policy_id)
-            logger.debug(f"Retrieved policy {policy_id}")
+            logger.debug("Retrieved policy %s", policy_id)
             return response['Policy']
         except ClientError as e:
-            logger.error(f"Failed to get policy: {e.response['Error']['Code']}")
+            logger.error("Failed to get policy: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to get policy: {str(e)}")
 
     def attach_policy(self, policy_id: str, target_id: str) -> bool:
         """Attach policy to target (OU or account)"""
         try:
             self.org_client.attach_policy(PolicyId=policy_id, TargetId=target_id)
-            logger.info(f"Attached policy {policy_id} to {target_id}")
+            logger.info("Attached policy %s to %s", policy_id, target_id)
             return True
         except ClientError as e:
-            logger.error(f"Failed to attach policy: {e.response['Error']['Code']}")
+            logger.error("Failed to attach policy: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to attach policy: {str(e)}")
 
     def detach_policy(self, policy_id: str, target_id: str) -> bool:
         """Detach policy from target"""
         try:
             self.org_client.detach_policy(PolicyId=policy_id, TargetId=target_id)
-            logger.info(f"Detached policy {policy_id} from {target_id}")
+            logger.info("Detached policy %s from %s", policy_id, target_id)
             return True
         except ClientError as e:
-            logger.error(f"Failed to detach policy: {e.response['Error']['Code']}")
+            logger.error("Failed to detach policy: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to detach policy: {str(e)}")
 
-    def list_targets_for_policy(self, policy_id: str) -> List[Dict[str, Any]]:
+    def list_targets_for_policy(self, policy_id: str, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
         """List all targets (OUs/accounts) a policy is attached to"""
         try:
-            targets = []
             paginator = self.org_client.get_paginator('list_targets_for_policy')
+            targets = list(chain.from_iterable(
+                page['Targets'] for page in paginator.paginate(
+                    PolicyId=policy_id, PaginationConfig=_pagination_config(max_items)
+                )
+            ))
             
-            for page in paginator.paginate(PolicyId=policy_id):
-                targets.extend(page['Targets'])
-            
-            logger.info(f"Retrieved {len(targets)} targets for policy {policy_id}")
+            logger.info("Retrieved %s targets for policy %s", len(targets), policy_id)
             return targets
         except ClientError as e:
-            logger.error(f"Failed to list policy targets: {e.response['Error']['Code']}")
+            logger.error("Failed to list policy targets: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to list policy targets: {str(e)}")
 
     # =========================================================================
@@ -269,30 +320,30 @@ class AWSOrganizationsManager:
         try:
             tag_list = [{'Key': k, 'Value': v} for k, v in tags.items()]
             self.org_client.tag_resource(ResourceId=resource_id, Tags=tag_list)
-            logger.info(f"Tagged resource {resource_id} with {len(tags)} tags")
+            logger.info("Tagged resource %s with %s tags", resource_id, len(tags))
             return True
         except ClientError as e:
-            logger.error(f"Failed to tag resource: {e.response['Error']['Code']}")
+            logger.error("Failed to tag resource: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to tag resource: {str(e)}")
 
     def list_tags_for_resource(self, resource_id: str) -> List[Dict[str, str]]:
         """List tags for a resource"""
         try:
             response = self.org_client.list_tags_for_resource(ResourceId=resource_id)
-            logger.debug(f"Retrieved tags for {resource_id}")
+            logger.debug("Retrieved tags for %s", resource_id)
             return response['Tags']
         except ClientError as e:
-            logger.error(f"Failed to list tags: {e.response['Error']['Code']}")
+            logger.error("Failed to list tags: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to list tags: {str(e)}")
 
     def untag_resource(self, resource_id: str, tag_keys: List[str]) -> bool:
         """Remove tags from resource"""
         try:
             self.org_client.untag_resource(ResourceId=resource_id, TagKeys=tag_keys)
-            logger.info(f"Untagged {len(tag_keys)} tags from {resource_id}")
+            logger.info("Untagged %s tags from %s", len(tag_keys), resource_id)
             return True
         except ClientError as e:
-            logger.error(f"Failed to untag resource: {e.response['Error']['Code']}")
+            logger.error("Failed to untag resource: %s", e.response['Error']['Code'])
             raise OrganizationsException(f"Failed to untag resource: {str(e)}")
 
     # =========================================================================
@@ -304,10 +355,10 @@ class AWSOrganizationsManager:
         try:
             response = self.cloudtrail_client.describe_trails(includeShadowTrails=True)
             trails = response.get('trailList', [])
-            logger.info(f"Retrieved {len(trails)} CloudTrail trails")
+            logger.info("Retrieved %s CloudTrail trails", len(trails))
             return {'trails': trails, 'trail_count': len(trails)}
         except ClientError as e:
-            logger.error(f"Failed to get CloudTrail status: {e.response['Error']['Code']}")
+            logger.error("Failed to get CloudTrail status: %s", e.response['Error']['Code'])
             return {'error': str(e), 'trail_count': 0}
 
     # =========================================================================
@@ -319,10 +370,10 @@ class AWSOrganizationsManager:
         try:
             response = self.config_client.describe_compliance_by_config_rule()
             rules = response.get('ComplianceByConfigRules', [])
-            logger.info(f"Retrieved compliance for {len(rules)} Config rules")
+            logger.info("Retrieved compliance for %s Config rules", len(rules))
             return {'rules': rules, 'rule_count': len(rules)}
         except ClientError as e:
-            logger.error(f"Failed to get Config compliance: {e.response['Error']['Code']}")
+            logger.error("Failed to get Config compliance: %s", e.response['Error']['Code'])
             return {'error': str(e), 'rule_count': 0}
 
     # =========================================================================
@@ -332,12 +383,21 @@ class AWSOrganizationsManager:
     def generate_organization_report(self) -> Dict[str, Any]:
         """Generate comprehensive organization report"""
         try:
-            org_info = self.get_organization_info()
-            accounts = self.list_accounts()
-            ous = self.list_ous()
-            policies = self.list_policies()
-            cloudtrail_status = self.get_cloudtrail_status()
-            config_compliance = self.get_config_compliance()
+            # The six lookups are independent network calls; run them concurrently
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                org_info_future = executor.submit(self.get_organization_info)
+                accounts_future = executor.submit(self.list_accounts)
+                ous_future = executor.submit(self.list_ous)
+                policies_future = executor.submit(self.list_policies)
+                cloudtrail_future = executor.submit(self.get_cloudtrail_status)
+                config_future = executor.submit(self.get_config_compliance)
+
+            org_info = org_info_future.result()
+            accounts = accounts_future.result()
+            ous = ous_future.result()
+            policies = policies_future.result()
+            cloudtrail_status = cloudtrail_future.result()
+            config_compliance = config_future.result()
 
             report = {
                 'timestamp': datetime.now().isoformat(),
@@ -353,8 +413,12 @@ class AWSOrganizationsManager:
                 'features_enabled': org_info.get('AvailablePolicyTypes', [])
             }
             
-            logger.info(f"Generated organization report with {len(accounts)} accounts, {len(ous)} OUs")
+            logger.info("Generated organization report with %s accounts, %s OUs", len(accounts), len(ous))
             return report
         except Exception as e:
-            logger.error(f"Failed to generate report: {str(e)}")
+            logger.error("Failed to generate report: %s", e)
             raise OrganizationsException(f"Failed to generate report: {str(e)}")
+
+    def generate_organization_report_bytes(self) -> bytes:
+        """Generate the organization report serialized as UTF-8 JSON (for S3, HTTP, etc.)"""
+        return json_dumps(self.generate_organization_report())
@@ -0,0 +1,34 @@
+"""Process-wide boto3 session and client cache shared by the AWS clients"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+_session: Optional[boto3.Session] = None
+_clients: Dict[Tuple[str, str, Optional[Config]], Any] = {}
+_lock = threading.Lock()
+
+
+def get_client(service: str, region: str, config: Optional[Config] = None) -> Any:
+    """
+    Return a cached boto3 client for (service, region, config)
+    
+    All clients come from one boto3.Session, so service models and endpoint
+    data are loaded once per process. Clients are thread-safe and shared
+    between managers. config is keyed by identity; pass module-level Config
+    objects rather than building a new one per call.
+    """
+    global _session
+    key = (service, region, config)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                if _session is None:
+                    _session = boto3.Session()
+                client = _session.client(service, region_name=region, config=config)
+                _clients[key] = client
+    return client
@@ -1,6 +1,6 @@
 """Agent core modules"""
 
-from src.core.logger import setup_logger
-from src.core.state import AgentState, StateManager
+from src.core.logger import setup_logger, shutdown_loggers
+from src.core.state import AgentStatus, StateManager
 
-__all__ = ["setup_logger", "AgentState", "StateManager"]
+__all__ = ["setup_logger", "shutdown_loggers", "AgentStatus", "StateManager"]
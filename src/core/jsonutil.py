@@ -0,0 +1,35 @@
+"""JSON helpers that use orjson when installed and fall back to the stdlib"""
+
+import json
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Union
+
+__all__ = ["json_default", "json_dumps", "json_loads"]
+
+
+def json_default(obj: Any) -> Any:
+    """Serialize values the stdlib encoder rejects (e.g. datetimes in AWS results)"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, deque)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+json_loads: Callable[[Union[str, bytes]], Any]
+
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> bytes:
+        """Encode obj as UTF-8 JSON bytes"""
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+    json_loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    def json_dumps(obj: Any) -> bytes:
+        """Encode obj as UTF-8 JSON bytes"""
+        return json.dumps(obj, default=json_default).encode('utf-8')
+
+    json_loads = json.loads
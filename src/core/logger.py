@@ -1,9 +1,15 @@
 """Logging configuration for AI-Med-Agent"""
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
+from typing import Dict
+
+# Background listeners that own the file/console handlers, keyed by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
 
 
 def setup_logger(
@@ -14,21 +20,32 @@ def setup_logger(
     """
     Configure and return a logger instance with both file and console handlers
     
+    Records still have their message merged with its args on the calling
+    thread (QueueHandler.prepare formats before enqueueing); only the
+    handlers' formatting and the file/console I/O run on a background
+    QueueListener, so callers never block on disk writes or log rotation.
+    
     Args:
         name: Logger name (typically __name__)
-        level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        level: Logging level name (e.g. DEBUG, INFO, WARN/WARNING, ERROR, CRITICAL)
         log_file: Path to log file
     
     Returns:
         Configured logger instance
     """
+    # Resolve once, accepting every name logging knows (incl. WARN, NOTSET);
+    # an unknown level name fails before any setup
+    lvl = logging.getLevelName(level.upper())
+    if not isinstance(lvl, int):
+        raise ValueError(f"Unknown log level: {level}")
+    
     # Create logs directory if it doesn't exist
     log_path = Path(log_file).parent
     log_path.mkdir(parents=True, exist_ok=True)
     
     # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level))
+    logger.setLevel(lvl)
     
     # Avoid duplicate handlers
     if logger.handlers:
@@ -46,14 +63,35 @@ def setup_logger(
         maxBytes=10485760,  # 10MB
         backupCount=5
     )
-    file_handler.setLevel(getattr(logging, level))
+    file_handler.setLevel(lvl)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level))
+    console_handler.setLevel(lvl)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    # Hand records to a background listener thread that owns both handlers;
+    # stop any listener left from an earlier setup so its thread isn't orphaned
+    previous = _listeners.pop(name, None)
+    if previous is not None:
+        previous.stop()
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    _listeners[name] = listener
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     return logger
+
+
+def shutdown_loggers() -> None:
+    """Flush and stop all background log listeners (also runs at interpreter exit)"""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
+
+atexit.register(shutdown_loggers)
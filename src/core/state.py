@@ -1,14 +1,26 @@
 """Agent state management for autonomous operations"""
 
 import logging
-from dataclasses import dataclass, asdict
+import sys
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, NamedTuple, Optional, Tuple
 from datetime import datetime
+from src.core.jsonutil import json_dumps
 
 logger = logging.getLogger(__name__)
 
 
+def _ns_to_iso(ns: Optional[int]) -> Optional[str]:
+    """Format a time.time_ns() timestamp as a local ISO 8601 string"""
+    if ns is None:
+        return None
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000).isoformat()
+
+
 class AgentStatus(Enum):
     """Agent execution status"""
     IDLE = "idle"
@@ -29,7 +41,15 @@ class DecisionOutcome(Enum):
     ABORT = "abort"
 
 
-@dataclass
+# Enum .value goes through a descriptor; plain dict lookups are cheaper
+_STATUS_VALUE = {status: status.value for status in AgentStatus}
+_OUTCOME_VALUE = {outcome: outcome.value for outcome in DecisionOutcome}
+
+# slots=True needs Python 3.10+; on 3.9 AgentAction keeps its __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class AgentAction:
     """Represents a single action to be executed"""
     action_type: str
@@ -42,36 +62,88 @@ class AgentAction:
     status: str = "pending"
     result: Optional[Any] = None
     error: Optional[str] = None
-    created_at: str = None
-    completed_at: Optional[str] = None
+    # Nanoseconds since the epoch (time.time_ns()); exported as ISO strings
+    created_at: Optional[int] = None
+    completed_at: Optional[int] = None
 
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+            self.created_at = time.time_ns()
+
+
+class Decision(NamedTuple):
+    """A logged agent decision (expanded to a dict on export)"""
+    timestamp: int  # time.time_ns()
+    type: str
+    outcome: str
+    reasoning: str
+    data: Dict[str, Any]
+
+
+def _action_to_dict(action: AgentAction) -> Dict[str, Any]:
+    """Shallow dict of an action's fields (parameters/result are shared, not copied)"""
+    # Spelled out as one dict display instead of looping over fields(); keep
+    # it in field order when AgentAction changes
+    return {
+        'action_type': action.action_type,
+        'description': action.description,
+        'parameters': action.parameters,
+        'requires_approval': action.requires_approval,
+        'priority': action.priority,
+        'retry_count': action.retry_count,
+        'max_retries': action.max_retries,
+        'status': action.status,
+        'result': action.result,
+        'error': action.error,
+        'created_at': _ns_to_iso(action.created_at),
+        'completed_at': _ns_to_iso(action.completed_at),
+    }
 
 
 class StateManager:
     """Manage agent state across autonomous operations"""
 
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, max_history: Optional[int] = 10_000):
         self.agent_id = agent_id
-        self.status = AgentStatus.IDLE
+        # Bumped on every mutation; get_state_summary reuses its last result
+        # until this changes
+        self._version = 0
+        self._summary_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._status = AgentStatus.IDLE
         self.current_action: Optional[AgentAction] = None
-        self.action_history: List[AgentAction] = []
-        self.decision_log: List[Dict[str, Any]] = []
-        self.errors: List[str] = []
+        # Last max_history finished actions (None keeps all); metrics still
+        # count every action
+        self.action_history: Deque[AgentAction] = deque(maxlen=max_history)
+        # Status each history entry was recorded under, kept in step with
+        # action_history so eviction doesn't depend on the action's current status
+        self._history_statuses: Deque[str] = deque(maxlen=max_history)
+        self._actions_by_status: Dict[str, Deque[AgentAction]] = defaultdict(deque)
+        self.decision_log: List[Decision] = []
+        # Only the most recent errors are kept here; every retained error is
+        # still on its failed action in the history
+        self.errors: Deque[str] = deque(maxlen=10)
         self.metrics = {
             'actions_executed': 0,
             'actions_failed': 0,
             'decisions_made': 0,
             'approvals_required': 0,
         }
-        logger.info(f"StateManager initialized for agent {agent_id}")
+        logger.info("StateManager initialized for agent %s", agent_id)
+
+    @property
+    def status(self) -> AgentStatus:
+        """Current agent status"""
+        return self._status
+
+    @status.setter
+    def status(self, status: AgentStatus) -> None:
+        self._status = status
+        self._version += 1
 
     def set_status(self, status: AgentStatus) -> None:
         """Update agent status"""
         self.status = status
-        logger.info(f"Agent {self.agent_id} status changed to {status.value}")
+        logger.info("Agent %s status changed to %s", self.agent_id, _STATUS_VALUE[status])
 
     def create_action(
         self,
@@ -89,34 +161,53 @@ class StateManager:
             requires_approval=requires_approval,
             priority=priority
         )
-        logger.debug(f"Created action: {action_type} - {description}")
+        logger.debug("Created action: %s - %s", action_type, description)
         return action
 
     def queue_action(self, action: AgentAction) -> None:
         """Queue an action for execution"""
         self.current_action = action
-        logger.info(f"Queued action: {action.action_type}")
+        self._version += 1
+        logger.info("Queued action: %s", action.action_type)
 
     def complete_action(self, result: Any = None) -> None:
         """Mark current action as completed"""
         if self.current_action:
             self.current_action.status = "completed"
             self.current_action.result = result
-            self.current_action.completed_at = datetime.now().isoformat()
-            self.action_history.append(self.current_action)
+            self.current_action.completed_at = time.time_ns()
+            self._record_action(self.current_action)
             self.metrics['actions_executed'] += 1
-            logger.info(f"Completed action: {self.current_action.action_type}")
+            self._version += 1
+            logger.info("Completed action: %s", self.current_action.action_type)
 
     def fail_action(self, error: str) -> None:
         """Mark current action as failed"""
         if self.current_action:
             self.current_action.status = "failed"
             self.current_action.error = error
-            self.current_action.completed_at = datetime.now().isoformat()
-            self.action_history.append(self.current_action)
+            self.current_action.completed_at = time.time_ns()
+            self._record_action(self.current_action)
             self.metrics['actions_failed'] += 1
             self.errors.append(error)
-            logger.error(f"Action failed: {self.current_action.action_type} - {error}")
+            self._version += 1
+            logger.error("Action failed: %s - %s", self.current_action.action_type, error)
+
+    def _record_action(self, action: AgentAction) -> None:
+        """Append a finished action to the history and status index"""
+        history = self.action_history
+        if len(history) == history.maxlen:
+            # The oldest entry is about to fall off; it is also the oldest
+            # entry in the bucket it was recorded under, even if the action
+            # has since been re-recorded with another status
+            self._actions_by_status[self._history_statuses[0]].popleft()
+        history.append(action)
+        self._history_statuses.append(action.status)
+        self._actions_by_status[action.status].append(action)
+
+    def list_actions_by_status(self, status: str) -> List[AgentAction]:
+        """Get historical actions with the given final status without scanning history"""
+        return list(self._actions_by_status.get(status, ()))
 
     def log_decision(
         self,
@@ -126,39 +217,53 @@ class StateManager:
         data: Optional[Dict[str, Any]] = None
     ) -> None:
         """Log a decision made by the agent"""
-        decision = {
-            'timestamp': datetime.now().isoformat(),
-            'type': decision_type,
-            'outcome': outcome.value,
-            'reasoning': reasoning,
-            'data': data or {}
-        }
-        self.decision_log.append(decision)
+        outcome_value = _OUTCOME_VALUE[outcome]
+        self.decision_log.append(
+            Decision(time.time_ns(), decision_type, outcome_value, reasoning, data or {})
+        )
         self.metrics['decisions_made'] += 1
         
         if outcome == DecisionOutcome.REQUIRE_APPROVAL:
             self.metrics['approvals_required'] += 1
+        self._version += 1
         
-        logger.info(f"Decision logged: {decision_type} -> {outcome.value}")
+        logger.info("Decision logged: %s -> %s", decision_type, outcome_value)
 
     def get_state_summary(self) -> Dict[str, Any]:
-        """Get current state summary"""
-        return {
-            'agent_id': self.agent_id,
-            'status': self.status.value,
-            'current_action': asdict(self.current_action) if self.current_action else None,
-            'total_actions': len(self.action_history),
-            'total_decisions': len(self.decision_log),
-            'metrics': self.metrics,
-            'errors': self.errors[-10:],  # Last 10 errors
-        }
+        """Get current state summary (memoized until the next state mutation)"""
+        cached = self._summary_cache
+        if cached is None or cached[0] != self._version:
+            summary: Dict[str, Any] = {
+                'agent_id': self.agent_id,
+                'status': _STATUS_VALUE[self._status],
+                'current_action': _action_to_dict(self.current_action) if self.current_action else None,
+                'total_actions': self.metrics['actions_executed'] + self.metrics['actions_failed'],
+                'total_decisions': len(self.decision_log),
+                'metrics': self.metrics,
+                'errors': list(self.errors),  # Last 10 errors
+            }
+            self._summary_cache = cached = (self._version, summary)
+
+        # Copy the mutable values too so callers cannot edit the cached entry
+        summary = dict(cached[1])
+        summary['errors'] = list(summary['errors'])
+        if summary['current_action'] is not None:
+            summary['current_action'] = dict(summary['current_action'])
+        return summary
 
     def export_history(self) -> Dict[str, Any]:
         """Export complete operation history"""
         return {
             'agent_id': self.agent_id,
-            'actions': [asdict(action) for action in self.action_history],
-            'decisions': self.decision_log,
+            'actions': [_action_to_dict(action) for action in self.action_history],
+            'decisions': [
+                {**decision._asdict(), 'timestamp': _ns_to_iso(decision.timestamp)}
+                for decision in self.decision_log
+            ],
             'metrics': self.metrics,
-            'errors': self.errors,
+            'errors': [action.error for action in self._actions_by_status.get("failed", ())],
         }
+
+    def export_history_json(self) -> bytes:
+        """Export complete operation history as UTF-8 JSON (orjson when installed)"""
+        return json_dumps(self.export_history())
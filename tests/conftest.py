@@ -2,7 +2,7 @@
 
 import pytest
 import logging
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 from src.agent.orchestrator import AgentOrchestrator
 from src.core.state import StateManager, AgentStatus
 from src.clients.organizations_manager import AWSOrganizationsManager
@@ -12,7 +12,7 @@ from src.clients.config_manager import ConfigManager
 @pytest.fixture
 def mock_org_manager():
     """Mock AWS Organizations Manager"""
-    manager = MagicMock(spec=AWSOrganizationsManager)
+    manager = Mock(spec=AWSOrganizationsManager)
     manager.get_organization_info.return_value = {
         'Id': '<ORG_ID>',
         'MasterAccountId': '<ACCOUNT_ID>',
@@ -33,7 +33,7 @@ def mock_org_manager():
 @pytest.fixture
 def mock_config_manager():
     """Mock Config Manager"""
-    manager = MagicMock(spec=ConfigManager)
+    manager = Mock(spec=ConfigManager)
     manager.get_feature_flags.return_value = {'auto_governance': True}
     return manager
 
@@ -0,0 +1,108 @@
+"""Unit tests for configuration manager"""
+
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.clients.config_manager import ConfigManager
+
+
+class FakeAppConfigData:
+    """AppConfigData stand-in that rejects reused configuration tokens like the real service"""
+
+    def __init__(self, payloads=(b'{"values": {"auto_governance": {"enabled": true}}}',),
+                 poll_interval=60):
+        self._lock = threading.Lock()
+        self._used_tokens = set()
+        self._next_token = 0
+        self._payloads = list(payloads)
+        self._poll_interval = poll_interval
+        self.polls = 0
+
+    def _issue_token(self):
+        self._next_token += 1
+        return f"token-{self._next_token}"
+
+    def start_configuration_session(self, **kwargs):
+        with self._lock:
+            return {"InitialConfigurationToken": self._issue_token()}
+
+    def get_latest_configuration(self, ConfigurationToken):
+        with self._lock:
+            if ConfigurationToken in self._used_tokens:
+                raise ClientError(
+                    {"Error": {"Code": "BadRequestException", "Message": "token reused"}},
+                    "GetLatestConfiguration",
+                )
+            self._used_tokens.add(ConfigurationToken)
+            payload = self._payloads[min(self.polls, len(self._payloads) - 1)]
+            self.polls += 1
+            next_token = self._issue_token()
+        # Widen the window in which an unsynchronized caller could reuse the token
+        time.sleep(0.01)
+        return {
+            "NextPollConfigurationToken": next_token,
+            "NextPollIntervalInSeconds": self._poll_interval,
+            "VersionLabel": "1",
+            "Configuration": io.BytesIO(payload),
+        }
+
+
+@pytest.fixture
+def config_manager():
+    """Config manager whose boto3 clients and secret cache are mocks"""
+    with patch("src.clients.config_manager.get_client", side_effect=lambda *_: MagicMock()), \
+            patch("src.clients.config_manager._get_secret_cache"):
+        manager = ConfigManager()
+    manager.appconfigdata_client = FakeAppConfigData()
+    return manager
+
+
+class TestAppConfigPolling:
+    """Test cases for AppConfig session reuse"""
+
+    def test_concurrent_feature_flag_reads_share_one_poll(self, config_manager):
+        """Test concurrent callers never send the same single-use token twice"""
+        start = threading.Barrier(8)
+
+        def read_flags():
+            start.wait()
+            return config_manager.get_feature_flags()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: read_flags(), range(8)))
+
+        assert all(flags == {"auto_governance": True} for flags in results)
+        assert config_manager.appconfigdata_client.polls == 1
+
+    def test_feature_flags_follow_payload_not_version_label(self, config_manager):
+        """Test new content deployed under a reused VersionLabel replaces the cached flags"""
+        config_manager.appconfigdata_client = FakeAppConfigData(
+            payloads=[
+                b'{"values": {"auto_governance": {"enabled": true}}}',
+                b'{"values": {"auto_governance": {"enabled": false}}}',
+            ],
+            poll_interval=0,
+        )
+
+        assert config_manager.get_feature_flags() == {"auto_governance": True}
+        assert config_manager.get_feature_flags() == {"auto_governance": False}
+
+
+class TestSecretCaching:
+    """Test cases for parsed secret reuse"""
+
+    def test_cached_secret_is_copied_per_call(self, config_manager):
+        """Test edits to a returned secret don't leak into the shared parse cache"""
+        secret_string = '{"username": "admin", "password": "pw"}'
+        config_manager._secret_cache.get_secret_string.return_value = secret_string
+
+        first = config_manager.get_secret("db-credentials")
+        first["password"] = "tampered"
+
+        assert config_manager.get_secret("db-credentials") == {"username": "admin", "password": "pw"}
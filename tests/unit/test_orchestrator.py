@@ -1,9 +1,13 @@
 """Unit tests for agent orchestrator"""
 
+import json
+import threading
 import pytest
+from dataclasses import fields
+from datetime import datetime
 from unittest.mock import MagicMock
 from src.agent.orchestrator import AgentOrchestrator
-from src.core.state import AgentStatus, DecisionOutcome, AgentAction
+from src.core.state import AgentStatus, DecisionOutcome, AgentAction, StateManager
 
 
 class TestAgentOrchestrator:
@@ -42,6 +46,29 @@ class TestAgentOrchestrator:
         outcome = agent_orchestrator.evaluate_action(action)
         assert outcome == DecisionOutcome.REQUIRE_APPROVAL
 
+    @pytest.mark.parametrize("action_type", sorted(AgentOrchestrator._RISKY_ACTIONS))
+    def test_evaluate_action_risky_set_membership(self, agent_orchestrator, action_type):
+        """Test every risky action type requires approval"""
+        agent_orchestrator.require_approval = True
+        action = agent_orchestrator.state.create_action(
+            action_type=action_type,
+            description="Risky action",
+            parameters={}
+        )
+        outcome = agent_orchestrator.evaluate_action(action)
+        assert outcome == DecisionOutcome.REQUIRE_APPROVAL
+
+    def test_evaluate_action_failed_state_skips(self, agent_orchestrator):
+        """Test that a failed agent skips actions before any approval checks"""
+        agent_orchestrator.state.set_status(AgentStatus.FAILED)
+        action = agent_orchestrator.state.create_action(
+            action_type="delete_ou",
+            description="Delete OU",
+            parameters={"ou_id": "ou-123"}
+        )
+        outcome = agent_orchestrator.evaluate_action(action)
+        assert outcome == DecisionOutcome.SKIP
+
     def test_execute_action_success(self, agent_orchestrator):
         """Test successful action execution"""
         agent_orchestrator.org_manager.create_ou.return_value = "ou-new-123"
@@ -67,6 +94,30 @@ class TestAgentOrchestrator:
         with pytest.raises(ValueError, match="No handler for action type"):
             agent_orchestrator.execute_action(action, skip_approval_check=True)
 
+    @pytest.mark.parametrize("action_type,parameters,message", [
+        ("create_ou", {"parent_id": "root"}, "parent_id and ou_name are required"),
+        ("delete_ou", {}, "ou_id is required"),
+        ("create_account", {"email": "a@example.com"}, "email and account_name are required"),
+        ("move_account", {"account_id": "acc-123"},
+         "account_id, source_parent_id, and destination_parent_id are required"),
+        ("attach_policy", {"policy_id": "p-123"}, "policy_id and target_id are required"),
+        ("detach_policy", {"target_id": "ou-123"}, "policy_id and target_id are required"),
+        ("tag_resource", {"resource_id": "ou-123"}, "resource_id and tags are required"),
+        ("tag_resources_bulk", {"items": []}, "items is required"),
+    ])
+    def test_execute_action_missing_parameters(
+        self, agent_orchestrator, action_type, parameters, message
+    ):
+        """Test required parameter validation for built-in handlers"""
+        action = agent_orchestrator.state.create_action(
+            action_type=action_type,
+            description="Missing parameters",
+            parameters=parameters
+        )
+        
+        with pytest.raises(ValueError, match=message):
+            agent_orchestrator.execute_action(action, skip_approval_check=True)
+
     def test_execute_action_with_exception(self, agent_orchestrator):
         """Test action execution with exception"""
         agent_orchestrator.org_manager.create_ou.side_effect = Exception("API Error")
@@ -82,6 +133,116 @@ class TestAgentOrchestrator:
         
         assert agent_orchestrator.state.status == AgentStatus.FAILED
 
+    def test_execute_actions_batch(self, agent_orchestrator):
+        """Test concurrent batch execution keeps results in order"""
+        agent_orchestrator.org_manager.tag_resource.return_value = True
+        agent_orchestrator.org_manager.create_ou.return_value = "ou-new-123"
+        
+        actions = [
+            agent_orchestrator.state.create_action(
+                action_type="tag_resource",
+                description="Tag account",
+                parameters={"resource_id": f"acc-{i}", "tags": {"env": "prod"}}
+            )
+            for i in range(3)
+        ]
+        actions.append(agent_orchestrator.state.create_action(
+            action_type="create_ou",
+            description="Create test OU",
+            parameters={"parent_id": "root", "ou_name": "test"}
+        ))
+        
+        results = agent_orchestrator.execute_actions(actions, max_workers=4)
+        assert results == [True, True, True, "ou-new-123"]
+        assert len(agent_orchestrator.state.action_history) == 4
+        assert agent_orchestrator.state.status == AgentStatus.COMPLETED
+
+    def test_execute_actions_runs_handlers_concurrently(self, agent_orchestrator):
+        """Test independent batch actions overlap instead of running one by one"""
+        # Each handler waits for the other; a serialized batch breaks the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        agent_orchestrator.register_action_handler(
+            "wait_for_peer", lambda action: barrier.wait() is not None
+        )
+        actions = [
+            agent_orchestrator.state.create_action(
+                action_type="wait_for_peer",
+                description="Wait for peer",
+                parameters={}
+            )
+            for _ in range(2)
+        ]
+        
+        results = agent_orchestrator.execute_actions(actions, max_workers=2)
+        assert results == [True, True]
+        assert agent_orchestrator.state.metrics['actions_executed'] == 2
+
+    def test_execute_actions_batch_failure(self, agent_orchestrator):
+        """Test batch execution records every outcome before raising"""
+        agent_orchestrator.org_manager.create_ou.side_effect = Exception("API Error")
+        agent_orchestrator.org_manager.tag_resource.return_value = True
+        
+        actions = [
+            agent_orchestrator.state.create_action(
+                action_type="create_ou",
+                description="Create test OU",
+                parameters={"parent_id": "root", "ou_name": "test"}
+            ),
+            agent_orchestrator.state.create_action(
+                action_type="tag_resource",
+                description="Tag account",
+                parameters={"resource_id": "acc-1", "tags": {"env": "prod"}}
+            ),
+        ]
+        
+        with pytest.raises(Exception, match="API Error"):
+            agent_orchestrator.execute_actions(actions, skip_approval_check=True)
+        
+        assert agent_orchestrator.state.metrics['actions_failed'] == 1
+        assert agent_orchestrator.state.metrics['actions_executed'] == 1
+        assert agent_orchestrator.state.status == AgentStatus.FAILED
+
+    def test_execute_actions_batch_requires_approval(self, agent_orchestrator):
+        """Test a batch needing approval runs nothing and leaves the agent idle"""
+        actions = [
+            agent_orchestrator.state.create_action(
+                action_type="tag_resource",
+                description="Tag account",
+                parameters={"resource_id": "acc-1", "tags": {"env": "prod"}}
+            ),
+            agent_orchestrator.state.create_action(
+                action_type="delete_ou",
+                description="Delete OU",
+                parameters={"ou_id": "ou-old"}
+            ),
+        ]
+        
+        with pytest.raises(PermissionError):
+            agent_orchestrator.execute_actions(actions)
+        
+        agent_orchestrator.org_manager.tag_resource.assert_not_called()
+        agent_orchestrator.org_manager.delete_ou.assert_not_called()
+        assert agent_orchestrator.state.status == AgentStatus.IDLE
+        assert [a.status for a in actions] == ["pending", "pending"]
+
+    def test_tag_resources_bulk(self, agent_orchestrator):
+        """Test bulk tagging splits tags into request-sized chunks"""
+        agent_orchestrator.org_manager.tag_resource.return_value = True
+        many_tags = {f"key-{i}": "value" for i in range(60)}
+        
+        action = agent_orchestrator.state.create_action(
+            action_type="tag_resources_bulk",
+            description="Tag accounts",
+            parameters={"items": [
+                {"resource_id": "acc-1", "tags": many_tags},
+                {"resource_id": "acc-2", "tags": {"env": "prod"}},
+            ]}
+        )
+        
+        result = agent_orchestrator.execute_action(action, skip_approval_check=True)
+        assert result == {'resources_tagged': 2, 'requests': 3}
+        assert agent_orchestrator.org_manager.tag_resource.call_count == 3
+
     def test_get_state_summary(self, agent_orchestrator):
         """Test state summary retrieval"""
         summary = agent_orchestrator.get_state_summary()
@@ -89,6 +250,7 @@ class TestAgentOrchestrator:
         assert summary['status'] == "idle"
         assert 'metrics' in summary
 
+    @pytest.mark.governance
     def test_run_autonomous_governance_check(self, agent_orchestrator):
         """Test autonomous governance check"""
         agent_orchestrator.org_manager.generate_organization_report.return_value = {
@@ -104,6 +266,7 @@ class TestAgentOrchestrator:
         assert 'report' in result
         assert 'analysis' in result
 
+    @pytest.mark.governance
     def test_analyze_governance_report_no_issues(self, agent_orchestrator):
         """Test governance report analysis with no issues"""
         report = {
@@ -119,6 +282,7 @@ class TestAgentOrchestrator:
         assert analysis['total_accounts'] == 1
         assert analysis['total_ous'] == 1
 
+    @pytest.mark.governance
     def test_analyze_governance_report_with_issues(self, agent_orchestrator):
         """Test governance report analysis with issues"""
         report = {
@@ -179,3 +343,146 @@ class TestActionCreation:
         assert state_manager.action_history[0].status == "failed"
         assert state_manager.metrics['actions_failed'] == 1
         assert len(state_manager.errors) == 1
+
+    def test_list_actions_by_status(self, state_manager):
+        """Test status index over action history"""
+        for outcome in ("completed", "failed", "completed"):
+            action = state_manager.create_action(
+                action_type="create_ou",
+                description="Create OU",
+                parameters={"parent_id": "root"}
+            )
+            state_manager.queue_action(action)
+            if outcome == "completed":
+                state_manager.complete_action(result="ou-123")
+            else:
+                state_manager.fail_action("API Error")
+        
+        assert len(state_manager.list_actions_by_status("completed")) == 2
+        assert len(state_manager.list_actions_by_status("failed")) == 1
+        assert state_manager.list_actions_by_status("pending") == []
+
+    def test_state_summary_refreshes_after_mutation(self, state_manager):
+        """Test memoized state summary is invalidated by state changes"""
+        first = state_manager.get_state_summary()
+        assert state_manager.get_state_summary() == first
+        
+        state_manager.set_status(AgentStatus.RUNNING)
+        summary = state_manager.get_state_summary()
+        assert summary['status'] == "running"
+        
+        state_manager.log_decision('test', DecisionOutcome.PROCEED, 'ok')
+        assert state_manager.get_state_summary()['total_decisions'] == 1
+
+    def test_export_history(self, state_manager):
+        """Test exported actions and decisions are plain dicts with ISO timestamps"""
+        action = state_manager.create_action(
+            action_type="create_ou",
+            description="Create OU",
+            parameters={"parent_id": "root"}
+        )
+        state_manager.queue_action(action)
+        state_manager.complete_action(result="ou-123")
+        
+        exported = state_manager.export_history()['actions']
+        assert len(exported) == 1
+        assert exported[0]['action_type'] == "create_ou"
+        assert exported[0]['parameters'] == {"parent_id": "root"}
+        assert exported[0]['result'] == "ou-123"
+        assert exported[0]['status'] == "completed"
+        assert datetime.fromisoformat(exported[0]['completed_at'])
+        
+        state_manager.log_decision('test', DecisionOutcome.REQUIRE_APPROVAL, 'risky')
+        decision = state_manager.export_history()['decisions'][0]
+        assert decision['type'] == 'test'
+        assert decision['outcome'] == 'require_approval'
+        assert decision['data'] == {}
+        assert datetime.fromisoformat(decision['timestamp'])
+
+    def test_errors_tail_is_bounded(self, state_manager):
+        """Test only recent errors are kept while export keeps all of them"""
+        for i in range(12):
+            action = state_manager.create_action(
+                action_type="create_ou",
+                description="Create OU",
+                parameters={"parent_id": "root"}
+            )
+            state_manager.queue_action(action)
+            state_manager.fail_action(f"API Error {i}")
+        
+        assert len(state_manager.errors) == 10
+        assert state_manager.get_state_summary()['errors'][-1] == "API Error 11"
+        assert len(state_manager.export_history()['errors']) == 12
+
+    def test_action_history_retention(self):
+        """Test action history keeps only the most recent actions"""
+        state_manager = StateManager("test-agent", max_history=3)
+        for i in range(5):
+            action = state_manager.create_action(
+                action_type="create_ou",
+                description=f"Create OU {i}",
+                parameters={"parent_id": "root"}
+            )
+            state_manager.queue_action(action)
+            if i % 2:
+                state_manager.fail_action("API Error")
+            else:
+                state_manager.complete_action(result="ou-123")
+        
+        assert [a.description for a in state_manager.action_history] == [
+            "Create OU 2", "Create OU 3", "Create OU 4"
+        ]
+        assert len(state_manager.list_actions_by_status("completed")) == 2
+        assert len(state_manager.list_actions_by_status("failed")) == 1
+        assert state_manager.get_state_summary()['total_actions'] == 5
+
+    def test_action_history_retention_after_retry(self):
+        """Test a retried action's earlier status entry is evicted with its history entry"""
+        state_manager = StateManager("test-agent", max_history=2)
+        action = state_manager.create_action(
+            action_type="create_ou",
+            description="Create OU",
+            parameters={"parent_id": "root"}
+        )
+        state_manager.queue_action(action)
+        state_manager.fail_action("API Error")
+        # Retry the same action object; it is recorded again as completed
+        state_manager.queue_action(action)
+        state_manager.complete_action(result="ou-123")
+        for _ in range(2):
+            state_manager.queue_action(state_manager.create_action(
+                action_type="create_ou",
+                description="Create OU",
+                parameters={"parent_id": "root"}
+            ))
+            state_manager.complete_action(result="ou-456")
+        
+        assert state_manager.list_actions_by_status("failed") == []
+        assert len(state_manager.list_actions_by_status("completed")) == 2
+
+    def test_export_history_has_every_action_field(self, state_manager):
+        """Test exported actions carry every AgentAction field in declaration order"""
+        action = state_manager.create_action(
+            action_type="create_ou",
+            description="Create OU",
+            parameters={"parent_id": "root"}
+        )
+        state_manager.queue_action(action)
+        state_manager.complete_action(result="ou-123")
+        
+        exported = state_manager.export_history()['actions'][0]
+        assert list(exported) == [f.name for f in fields(AgentAction)]
+        assert exported['result'] == "ou-123"
+
+    def test_export_history_json(self, state_manager):
+        """Test JSON export matches the dict export"""
+        action = state_manager.create_action(
+            action_type="create_ou",
+            description="Create OU",
+            parameters={"parent_id": "root"}
+        )
+        state_manager.queue_action(action)
+        state_manager.complete_action(result={"ou_id": "ou-123"})
+        state_manager.log_decision('test', DecisionOutcome.PROCEED, 'ok')
+        
+        assert json.loads(state_manager.export_history_json()) == state_manager.export_history()
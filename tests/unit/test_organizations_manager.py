@@ -0,0 +1,107 @@
+"""Unit tests for AWS Organizations manager"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.clients.organizations_manager import ORG_INFO_TTL, AWSOrganizationsManager
+
+
+@pytest.fixture
+def org_manager():
+    """Organizations manager whose boto3 clients are mocks"""
+    with patch("src.clients.organizations_manager.get_client", side_effect=lambda *_: MagicMock()):
+        return AWSOrganizationsManager()
+
+
+class TestPagination:
+    """Test cases for paginated list calls"""
+
+    def test_list_accounts_requests_full_pages(self, org_manager):
+        """Test accounts are flattened across pages with PageSize=20"""
+        paginator = org_manager.org_client.get_paginator.return_value
+        paginator.paginate.return_value = [
+            {'Accounts': [{'Id': 'acc-1'}, {'Id': 'acc-2'}]},
+            {'Accounts': [{'Id': 'acc-3'}]},
+        ]
+
+        accounts = org_manager.list_accounts()
+        assert [a['Id'] for a in accounts] == ['acc-1', 'acc-2', 'acc-3']
+        paginator.paginate.assert_called_once_with(PaginationConfig={'PageSize': 20})
+
+    def test_list_policies_max_items(self, org_manager):
+        """Test max_items is passed through as MaxItems"""
+        paginator = org_manager.org_client.get_paginator.return_value
+        paginator.paginate.return_value = [{'Policies': [{'Id': 'p-1'}]}]
+
+        assert org_manager.list_policies(max_items=1) == [{'Id': 'p-1'}]
+        paginator.paginate.assert_called_once_with(
+            Filter='SERVICE_CONTROL_POLICY',
+            PaginationConfig={'PageSize': 20, 'MaxItems': 1}
+        )
+
+    @pytest.mark.parametrize("method,args,key,kwargs", [
+        ("list_accounts_for_ou", ("ou-1",), 'Accounts', {'ParentId': 'ou-1'}),
+        ("list_targets_for_policy", ("p-1",), 'Targets', {'PolicyId': 'p-1'}),
+        ("list_ous", ("r-1",), 'OrganizationalUnits', {'ParentId': 'r-1'}),
+    ])
+    def test_list_methods_paginate(self, org_manager, method, args, key, kwargs):
+        """Test every list method pages with the shared pagination config"""
+        paginator = org_manager.org_client.get_paginator.return_value
+        paginator.paginate.return_value = [{key: [{'Id': 'x'}]}, {key: []}]
+
+        assert getattr(org_manager, method)(*args) == [{'Id': 'x'}]
+        paginator.paginate.assert_called_once_with(
+            PaginationConfig={'PageSize': 20}, **kwargs
+        )
+
+    def test_generate_organization_report(self, org_manager):
+        """Test the report combines every section"""
+        org_manager.org_client.describe_organization.return_value = {
+            'Organization': {'Id': 'o-1', 'AvailablePolicyTypes': []}
+        }
+        org_manager.org_client.list_roots.return_value = {'Roots': [{'Id': 'r-1'}]}
+        org_manager.org_client.get_paginator.return_value.paginate.side_effect = (
+            lambda **kwargs: [{
+                'Accounts': [{'Id': 'acc-1'}],
+                'OrganizationalUnits': [{'Id': 'ou-1'}],
+                'Policies': [{'Id': 'p-1', 'Name': 'FullAccess', 'Type': 'SERVICE_CONTROL_POLICY'}],
+            }]
+        )
+        org_manager.cloudtrail_client.describe_trails.return_value = {'trailList': [{}]}
+        org_manager.config_client.describe_compliance_by_config_rule.return_value = {
+            'ComplianceByConfigRules': [{}, {}]
+        }
+
+        report = org_manager.generate_organization_report()
+        assert report['accounts_count'] == 1
+        assert report['ous_count'] == 1
+        assert report['policies_count'] == 1
+        assert report['cloudtrail']['trail_count'] == 1
+        assert report['config']['rule_count'] == 2
+
+
+class TestOrganizationCaching:
+    """Test cases for cached organization lookups"""
+
+    def test_get_root_id_cached(self, org_manager):
+        """Test the root ID is looked up once"""
+        org_manager.org_client.list_roots.return_value = {'Roots': [{'Id': 'r-1'}]}
+
+        assert org_manager.get_root_id() == 'r-1'
+        assert org_manager.get_root_id() == 'r-1'
+        org_manager.org_client.list_roots.assert_called_once_with()
+
+    def test_get_organization_info_cached_until_ttl(self, org_manager):
+        """Test organization info is reused within the TTL and refetched after it"""
+        org_manager.org_client.describe_organization.return_value = {'Organization': {'Id': 'o-1'}}
+
+        with patch("src.clients.organizations_manager.time.monotonic", return_value=1000.0):
+            assert org_manager.get_organization_info() == {'Id': 'o-1'}
+            assert org_manager.get_organization_info() == {'Id': 'o-1'}
+        assert org_manager.org_client.describe_organization.call_count == 1
+
+        with patch("src.clients.organizations_manager.time.monotonic",
+                   return_value=1000.0 + ORG_INFO_TTL):
+            org_manager.get_organization_info()
+        assert org_manager.org_client.describe_organization.call_count == 2